@@ -1,181 +1,707 @@
 #!/usr/bin/env python3
 import argparse
+import contextlib
+import functools
+import hashlib
+import importlib.util
+import io
+import itertools
 import os
+import posixpath
+import stat
 import sys
-from typing import List, Optional, Tuple
-
-# Import required libraries for text extraction
-try:
-    from pdfminer.high_level import extract_text as extract_pdf_text
-except ImportError:
-    def extract_pdf_text(file_path):
-        print("Error: pdfminer.six not installed. Run 'pip install pdfminer.six'.")
-        sys.exit(1)
+import tempfile
+import uuid
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import IO, Any, Callable, Iterable, Iterator, List, Optional, TextIO, Tuple, Union, overload
 
-try:
-    import docx
-except ImportError:
-    def open_docx(file_path):
-        print("Error: python-docx not installed. Run 'pip install python-docx'.")
-        sys.exit(1)
-else:
-    def open_docx(file_path):
-        return docx.Document(file_path)
-
-try:
-    from pptx import Presentation
-except ImportError:
-    def open_pptx(file_path):
-        print("Error: python-pptx not installed. Run 'pip install python-pptx'.")
+# Libraries for text extraction are imported lazily by _load, so a run only pays the
+# import cost of the formats it actually processes; if one is missing, the user is told
+# which package to install
+_BACKEND_PACKAGES = {
+    "pdf": "pypdfium2",
+    "docx": "python-docx",
+    "pptx": "python-pptx",
+}
+
+
+class ExtractionError(Exception):
+    """Raised while streaming text when the underlying extractor fails."""
+
+
+def _err(message: str) -> None:
+    """Write a diagnostic or status message to stderr, keeping stdout for extracted text."""
+    sys.stderr.write(message + "\n")
+
+
+@functools.lru_cache(maxsize=None)
+def _load(backend: str) -> Callable:
+    """Import the library behind a backend on first use and return its entry point."""
+    if backend == "xml":
+        # DOCX and PPTX files are zip packages of XML parts; prefer lxml's C iterparse to read them
+        try:
+            from lxml.etree import iterparse
+        except ImportError:
+            from xml.etree.ElementTree import iterparse
+            return iterparse
+        # Parse like python-docx/python-pptx do: lxml before 5.0 expands external entities
+        # by default, which would let a crafted package read local files into the output
+        return functools.partial(iterparse, resolve_entities=False, no_network=True)
+    
+    if backend not in _BACKEND_PACKAGES:
+        raise ValueError(f"Unknown backend: {backend}")
+    
+    try:
+        if backend == "pdf":
+            # Prefer pypdfium2 (compiled PDFium bindings), fall back to pure-Python pdfminer.six
+            try:
+                import pypdfium2  # noqa: F401
+            except ImportError:
+                import pdfminer  # noqa: F401
+                return _extract_pdf_text_pdfminer
+            return _extract_pdf_text_pdfium
+        elif backend == "docx":
+            import docx
+            return docx.Document
+        else:
+            from pptx import Presentation
+            return Presentation
+    except ImportError:
+        package = _BACKEND_PACKAGES[backend]
+        _err(f"Error: {package} not installed. Run 'pip install {package}'.")
         sys.exit(1)
-else:
-    def open_pptx(file_path):
-        return Presentation(file_path)
+
+
+def _extract_pdf_text_pdfium(file_path: str) -> Tuple[str, int]:
+    import pypdfium2 as pdfium
+    
+    pdf = pdfium.PdfDocument(file_path)
+    try:
+        # The page count is known up front, so size the list once
+        page_count = len(pdf)
+        pages = [""] * page_count
+        for i in range(page_count):
+            page = pdf[i]
+            textpage = page.get_textpage()
+            # PDFium reports line breaks as CRLF; pages are separated by form feeds like pdfminer
+            pages[i] = textpage.get_text_range().replace("\r\n", "\n")
+            textpage.close()
+            page.close()
+        return "\f".join(pages), page_count
+    finally:
+        pdf.close()
+
+
+def _extract_pdf_text_pdfminer(file_path: str) -> Tuple[str, int]:
+    from pdfminer.converter import TextConverter
+    from pdfminer.layout import LAParams
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+    
+    resource_manager = PDFResourceManager()
+    with open(file_path, 'rb') as fp, io.StringIO() as out:
+        device = TextConverter(resource_manager, out, laparams=LAParams())
+        interpreter = PDFPageInterpreter(resource_manager, device)
+        page_count = 0
+        for page in PDFPage.get_pages(fp):
+            interpreter.process_page(page)
+            page_count += 1
+        device.close()
+        return out.getvalue(), page_count
+
+
+def extract_pdf_text(file_path: str) -> Tuple[str, int]:
+    """Return (text, page_count) for a PDF file using the best available backend."""
+    return _load("pdf")(file_path)
+
+
+def open_docx(file_path: str) -> Any:
+    return _load("docx")(file_path)
+
+
+def open_pptx(file_path: str) -> Any:
+    return _load("pptx")(file_path)
+
+
+def iterparse(source: IO[bytes], events: Tuple[str, ...] = ("end",)) -> Iterator[Tuple[str, Any]]:
+    return _load("xml")(source, events=events)
+
+
+WORDPROCESSINGML_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_P = WORDPROCESSINGML_NS + "p"
+_W_R = WORDPROCESSINGML_NS + "r"
+_W_HYPERLINK = WORDPROCESSINGML_NS + "hyperlink"
+_W_T = WORDPROCESSINGML_NS + "t"
+_W_BR = WORDPROCESSINGML_NS + "br"
+_W_BR_TYPE = WORDPROCESSINGML_NS + "type"
+# Other run content that contributes fixed text, mirroring python-docx's Run.text
+_W_RUN_CHARS = {
+    WORDPROCESSINGML_NS + "tab": "\t",
+    WORDPROCESSINGML_NS + "ptab": "\t",
+    WORDPROCESSINGML_NS + "cr": "\n",
+    WORDPROCESSINGML_NS + "noBreakHyphen": "-",
+}
+
+PRESENTATIONML_NS = "{http://schemas.openxmlformats.org/presentationml/2006/main}"
+DRAWINGML_NS = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+_P_SLD_ID = PRESENTATIONML_NS + "sldId"
+_P_SP = PRESENTATIONML_NS + "sp"
+_P_TX_BODY = PRESENTATIONML_NS + "txBody"
+_A_P = DRAWINGML_NS + "p"
+_A_T = DRAWINGML_NS + "t"
+# Paragraph content that contributes to shape text, mirroring python-pptx's _Paragraph.text
+_A_PARAGRAPH_TEXT = {
+    DRAWINGML_NS + "r": None,
+    DRAWINGML_NS + "fld": None,
+    DRAWINGML_NS + "br": "\v",
+}
+_R_ID = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+_PKG_RELATIONSHIP = "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"
+
+# Size of the user-space buffer used when writing extracted text to files
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+# Extracted text is cached per input file, keyed on (path, mtime, size) plus the
+# extractor that produced it. Bump CACHE_VERSION whenever extraction output changes.
+CACHE_VERSION = 1
+CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "xtotxt")
+
+
+def iter_text_from_pdf(file_path: str, verbose: bool = False) -> Iterator[str]:
+    """Yield the text of a PDF file. Extraction errors are raised to the caller."""
+    text, page_count = extract_pdf_text(file_path)
+    if verbose:
+        _err(f"Processed {page_count} pages from PDF file: {file_path}")
+    yield text
+
+
+def _docx_paragraph_text(paragraph: Any) -> str:
+    """Return the text of a w:p element from its runs, including runs inside hyperlinks."""
+    parts = []
+    for child in paragraph:
+        if child.tag == _W_R:
+            runs = (child,)
+        elif child.tag == _W_HYPERLINK:
+            runs = child.iterfind(_W_R)
+        else:
+            continue
+        for run in runs:
+            for node in run:
+                tag = node.tag
+                if tag == _W_T:
+                    parts.append(node.text or "")
+                elif tag == _W_BR:
+                    # Only line breaks become text; page and column breaks are dropped
+                    if node.get(_W_BR_TYPE, "textWrapping") == "textWrapping":
+                        parts.append("\n")
+                elif tag in _W_RUN_CHARS:
+                    parts.append(_W_RUN_CHARS[tag])
+    return "".join(parts)
+
+
+def _iter_docx_paragraphs(document: IO[bytes]) -> Iterator[str]:
+    """Stream body-level paragraph text out of word/document.xml.
+    
+    Like python-docx's Document.paragraphs this skips paragraphs nested in tables,
+    but it never builds the document object model and clears elements as it goes.
+    """
+    depth = 0
+    for event, element in iterparse(document, events=("start", "end")):
+        if event == "start":
+            depth += 1
+            continue
+        depth -= 1
+        # Body-level elements end at depth 2 (w:document > w:body > element)
+        if depth == 2:
+            if element.tag == _W_P:
+                yield _docx_paragraph_text(element)
+            element.clear()
+
+
+def iter_text_from_docx(file_path: str, verbose: bool = False) -> Iterator[str]:
+    """Yield the text of a DOCX file paragraph by paragraph. Extraction errors are raised to the caller."""
+    with zipfile.ZipFile(file_path) as archive:
+        try:
+            document = archive.open("word/document.xml")
+        except KeyError:
+            # Main document part stored under a non-standard name; let python-docx resolve it
+            paragraphs: Iterator[str] = (paragraph.text for paragraph in open_docx(file_path).paragraphs)
+        else:
+            paragraphs = _iter_docx_paragraphs(document)
+        
+        paragraph_count = 0
+        separator = ""
+        
+        for text in paragraphs:
+            yield separator
+            yield text
+            separator = "\n"
+            paragraph_count += 1
+    
+    if verbose:
+        _err(f"Processed {paragraph_count} paragraphs from DOCX file: {file_path}")
+
+
+def _pptx_slide_names(archive: zipfile.ZipFile) -> List[str]:
+    """Return the slide part names of a PPTX package in presentation order."""
+    with archive.open("ppt/_rels/presentation.xml.rels") as fp:
+        targets = {
+            element.get("Id"): element.get("Target")
+            for _, element in iterparse(fp)
+            if element.tag == _PKG_RELATIONSHIP
+        }
+    with archive.open("ppt/presentation.xml") as fp:
+        rel_ids = [element.get(_R_ID) for _, element in iterparse(fp) if element.tag == _P_SLD_ID]
+    
+    names = []
+    for rel_id in rel_ids:
+        target = targets[rel_id]
+        # Targets are relative to ppt/ unless given as absolute part names
+        if target.startswith("/"):
+            names.append(target[1:])
+        else:
+            names.append(posixpath.normpath(posixpath.join("ppt", target)))
+    return names
+
+
+def _pptx_shape_text(tx_body: Any) -> str:
+    """Return the text of a p:txBody element, one line per paragraph."""
+    lines = []
+    for paragraph in tx_body.iterfind(_A_P):
+        parts = []
+        for node in paragraph:
+            if node.tag in _A_PARAGRAPH_TEXT:
+                text = _A_PARAGRAPH_TEXT[node.tag]
+                if text is None:
+                    t = node.find(_A_T)
+                    text = t.text if t is not None and t.text else ""
+                parts.append(text)
+        lines.append("".join(parts))
+    return "\n".join(lines)
+
+
+def _pptx_slide_text(archive: zipfile.ZipFile, slide_name: str) -> List[str]:
+    """Stream the text of each top-level shape out of a slide part.
+    
+    Like python-pptx's Slide.shapes this only looks at shapes directly in the shape
+    tree, so group members and tables are skipped.
+    """
+    texts = []
+    depth = 0
+    with archive.open(slide_name) as slide:
+        for event, element in iterparse(slide, events=("start", "end")):
+            if event == "start":
+                depth += 1
+                continue
+            depth -= 1
+            # Shape-tree members end at depth 3 (p:sld > p:cSld > p:spTree > shape)
+            if depth == 3:
+                if element.tag == _P_SP:
+                    tx_body = element.find(_P_TX_BODY)
+                    if tx_body is not None:
+                        texts.append(_pptx_shape_text(tx_body))
+                element.clear()
+    return texts
+
+
+def iter_text_from_pptx(file_path: str, verbose: bool = False) -> Iterator[str]:
+    """Yield the text of a PPTX file slide by slide. Extraction errors are raised to the caller."""
+    with zipfile.ZipFile(file_path) as archive:
+        try:
+            slide_names = _pptx_slide_names(archive)
+        except KeyError:
+            # Presentation part stored under a non-standard name; let python-pptx resolve it
+            presentation = open_pptx(file_path)
+            slide_count = len(presentation.slides)
+            slides: Iterator[List[str]] = (
+                [shape.text_frame.text for shape in slide.shapes if shape.has_text_frame]
+                for slide in presentation.slides
+            )
+        else:
+            slide_count = len(slide_names)
+            # Slides are parsed one after another from this single handle; the parse is
+            # Python-bound, so threads would only add contention on the GIL
+            slides = (_pptx_slide_text(archive, name) for name in slide_names)
+        
+        text_shape_count = 0
+        separator = ""
+        
+        for i, slide_text in enumerate(slides, 1):
+            header_emitted = False
+            for text in slide_text:
+                if not text:
+                    continue
+                
+                # Only slides that contain text get a header
+                if not header_emitted:
+                    yield separator
+                    yield f"--- Slide {i} ---"
+                    separator = "\n"
+                    header_emitted = True
+                yield "\n"
+                yield text
+                text_shape_count += 1
+    
+    if verbose:
+        _err(f"Processed {slide_count} slides and {text_shape_count} text elements from PPTX file: {file_path}")
 
 
 def extract_text_from_pdf(file_path: str, verbose: bool = False) -> str:
     """Extract text from a PDF file."""
     try:
-        text = extract_pdf_text(file_path)
-        if verbose:
-            # Count pages (approximation)
-            with open(file_path, 'rb') as f:
-                page_count = 0
-                for line in f:
-                    if b'/Page ' in line:
-                        page_count += 1
-            print(f"Processed {page_count} pages from PDF file: {file_path}")
-        return text
+        return "".join(iter_text_from_pdf(file_path, verbose))
     except Exception as e:
-        print(f"Error extracting text from PDF: {str(e)}")
+        _err(f"Error extracting text from PDF: {str(e)}")
         return ""
 
 
 def extract_text_from_docx(file_path: str, verbose: bool = False) -> str:
     """Extract text from a DOCX file."""
     try:
-        doc = open_docx(file_path)
-        paragraphs = [p.text for p in doc.paragraphs]
-        text = "\n".join(paragraphs)
-        
-        if verbose:
-            print(f"Processed {len(paragraphs)} paragraphs from DOCX file: {file_path}")
-        
-        return text
+        return "".join(iter_text_from_docx(file_path, verbose))
     except Exception as e:
-        print(f"Error extracting text from DOCX: {str(e)}")
+        _err(f"Error extracting text from DOCX: {str(e)}")
         return ""
 
 
 def extract_text_from_pptx(file_path: str, verbose: bool = False) -> str:
     """Extract text from a PPTX file."""
     try:
-        presentation = open_pptx(file_path)
-        text_parts = []
-        
-        slide_count = len(presentation.slides)
-        text_shape_count = 0
-        
-        for i, slide in enumerate(presentation.slides, 1):
-            slide_text = []
-            for shape in slide.shapes:
-                if hasattr(shape, "text") and shape.text:
-                    slide_text.append(shape.text)
-                    text_shape_count += 1
-            
-            if slide_text:
-                text_parts.append(f"--- Slide {i} ---")
-                text_parts.extend(slide_text)
-        
-        if verbose:
-            print(f"Processed {slide_count} slides and {text_shape_count} text elements from PPTX file: {file_path}")
-        
-        return "\n".join(text_parts)
+        return "".join(iter_text_from_pptx(file_path, verbose))
     except Exception as e:
-        print(f"Error extracting text from PPTX: {str(e)}")
+        _err(f"Error extracting text from PPTX: {str(e)}")
         return ""
 
 
+# Streaming extractor for each supported format; adding a format is a registration here
+_FMT_TO_FN = {
+    "pdf": iter_text_from_pdf,
+    "docx": iter_text_from_docx,
+    "pptx": iter_text_from_pptx,
+}
+
+# Top-level folder every package of a zip-based format contains
+_PACKAGE_PREFIXES = {
+    "docx": "word/",
+    "pptx": "ppt/",
+}
+
+# Format inferred from each recognised file extension
+_EXT_TO_FMT = {
+    ".pdf": "pdf",
+    ".docx": "docx",
+    ".pptx": "pptx",
+}
+
+
 def determine_file_format(file_path: str, specified_format: Optional[str] = None) -> Optional[str]:
     """Determine the format of the file based on extension or specified format."""
     if specified_format:
         specified_format = specified_format.lower()
-        if specified_format in ["pdf", "docx", "pptx"]:
+        if specified_format in _FMT_TO_FN:
             return specified_format
-        else:
-            print(f"Error: Invalid format specified: {specified_format}")
-            return None
-    
-    _, extension = os.path.splitext(file_path)
-    extension = extension.lower()
-    
-    if extension == ".pdf":
-        return "pdf"
-    elif extension == ".docx":
-        return "docx"
-    elif extension == ".pptx":
-        return "pptx"
-    else:
-        print(f"Error: Unsupported file format for {file_path}")
+        _err(f"Error: Invalid format specified: {specified_format}")
         return None
+    
+    file_format = _EXT_TO_FMT.get(os.path.splitext(file_path)[1].lower())
+    if not file_format:
+        _err(f"Error: Unsupported file format for {file_path}")
+    return file_format
+
+
+def _wrap_errors(chunks: Iterator[str], file_format: str) -> Iterator[str]:
+    """Pass chunks through, turning extractor failures into an ExtractionError."""
+    try:
+        yield from chunks
+    except Exception as e:
+        raise ExtractionError(f"Error extracting text from {file_format.upper()}: {str(e)}") from e
 
 
-def extract_text(file_path: str, format_type: Optional[str] = None, verbose: bool = False) -> Optional[str]:
-    """Extract text from a file based on its format."""
-    if not os.path.exists(file_path):
-        print(f"Error: File not found: {file_path}")
+def _sniff(file_path: str, file_format: str) -> bool:
+    """Cheaply check that a file really is of the given format before parsing it.
+    
+    PDFs must carry the %PDF signature near the start; DOCX and PPTX must be zip
+    packages containing a word/ or ppt/ part respectively.
+    """
+    with open(file_path, 'rb') as f:
+        head = f.read(1024)
+    
+    if file_format == "pdf":
+        return b"%PDF" in head
+    
+    if not head.startswith(b"PK\x03\x04"):
+        return False
+    prefix = _PACKAGE_PREFIXES[file_format]
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            return any(name.startswith(prefix) for name in archive.namelist())
+    except zipfile.BadZipFile:
+        return False
+
+
+def _cache_path(file_path: str, file_format: str, st: os.stat_result) -> str:
+    """Return the cache file for a given input; keyed on stat so the input is never read."""
+    extractor = file_format
+    if file_format == "pdf":
+        # The PDF backends format text differently, so entries are per backend. Look the
+        # backend up without _load, which exits when neither is installed, so cached text
+        # can still be served
+        extractor = "pdf-pdfium" if importlib.util.find_spec("pypdfium2") else "pdf-pdfminer"
+    key = f"{CACHE_VERSION}|{extractor}|{os.path.abspath(file_path)}|{st.st_mtime_ns}|{st.st_size}"
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=20).hexdigest()
+    return os.path.join(CACHE_DIR, f"{digest}.txt")
+
+
+def _read_cache(cache: TextIO) -> Iterator[str]:
+    """Yield the contents of an open cache file in large blocks."""
+    with cache:
+        yield from iter(lambda: cache.read(OUTPUT_BUFFER_SIZE), "")
+
+
+def _write_through_cache(chunks: Iterator[str], cache_file: str) -> Iterator[str]:
+    """Pass chunks through while copying them into the cache.
+    
+    The entry is written to a temp file and only moved into place once the stream
+    completes without error, so failed or partial extractions are never cached.
+    Cache I/O errors are ignored.
+    """
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        cache: Optional[TextIO] = open(fd, 'w', encoding='utf-8', newline='', buffering=OUTPUT_BUFFER_SIZE)
+    except OSError:
+        yield from chunks
+        return
+    
+    complete = False
+    # Empty text also signals a failed extraction, so it is never cached
+    has_text = False
+    try:
+        for chunk in chunks:
+            if cache is not None and chunk:
+                try:
+                    cache.write(chunk)
+                    has_text = True
+                except OSError:
+                    cache.close()
+                    cache = None
+            yield chunk
+        complete = True
+    finally:
+        try:
+            if cache is not None:
+                cache.close()
+            if cache is not None and complete and has_text:
+                os.replace(tmp_path, cache_file)
+            else:
+                os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
+def iter_text(
+    file_path: str,
+    format_type: Optional[str] = None,
+    verbose: bool = False,
+    use_cache: bool = True,
+) -> Optional[Iterator[str]]:
+    """Return an iterator over the text of a file, or None if the file cannot be processed.
+    
+    Text is streamed in chunks so callers can write it out without holding the whole
+    document in memory. Cached text is reused for unchanged files. If extraction fails
+    part-way, iterating raises ExtractionError.
+    """
+    try:
+        st = os.stat(file_path)
+    except FileNotFoundError:
+        _err(f"Error: File not found: {file_path}")
+        return None
+    except OSError as e:
+        # e.g. a path through a regular file, or a directory without search permission
+        _err(f"Error reading file {file_path}: {str(e)}")
         return None
     
     file_format = determine_file_format(file_path, format_type)
     if not file_format:
         return None
     
-    if file_format == "pdf":
-        return extract_text_from_pdf(file_path, verbose)
-    elif file_format == "docx":
-        return extract_text_from_docx(file_path, verbose)
-    elif file_format == "pptx":
-        return extract_text_from_pptx(file_path, verbose)
-    else:
-        # This should not happen given the checks in determine_file_format
-        print(f"Error: Unsupported file format for {file_path}")
+    cache_file = None
+    if use_cache:
+        cache_file = _cache_path(file_path, file_format, st)
+        try:
+            cache = open(cache_file, 'r', encoding='utf-8', newline='')
+        except OSError:
+            pass
+        else:
+            if verbose:
+                _err(f"Loaded cached text for {file_format.upper()} file: {file_path}")
+            return _read_cache(cache)
+    
+    # Reject mislabeled or corrupt inputs before spinning up a parser
+    try:
+        is_valid = _sniff(file_path, file_format)
+    except OSError as e:
+        # e.g. a directory named like a document, or a file without read permission
+        _err(f"Error reading file {file_path}: {str(e)}")
         return None
+    if not is_valid:
+        _err(f"Error: Not a valid {file_format.upper()} file: {file_path}")
+        return None
+    
+    chunks = _FMT_TO_FN[file_format](file_path, verbose)
+    if cache_file:
+        chunks = _write_through_cache(chunks, cache_file)
+    return _wrap_errors(chunks, file_format)
 
 
-def handle_output(text: str, output_path: Optional[str], input_path: str) -> None:
-    """Handle the output of extracted text."""
-    if not text:
-        return
+def extract_text(
+    file_path: str,
+    format_type: Optional[str] = None,
+    verbose: bool = False,
+    use_cache: bool = True,
+) -> Optional[str]:
+    """Extract text from a file based on its format, reusing cached text for unchanged files."""
+    chunks = iter_text(file_path, format_type, verbose, use_cache)
+    if chunks is None:
+        return None
+    try:
+        return "".join(chunks)
+    except ExtractionError as e:
+        _err(str(e))
+        return ""
+
+
+@overload
+def _compute_out(input_path: str, output: str, output_is_dir: bool) -> str: ...
+@overload
+def _compute_out(input_path: str, output: Optional[str], output_is_dir: bool) -> Optional[str]: ...
+def _compute_out(input_path: str, output: Optional[str], output_is_dir: bool) -> Optional[str]:
+    """Map an input file to its output file; inside a directory output it is named after the input."""
+    if not output or not output_is_dir:
+        return output
+    name_without_ext = os.path.splitext(os.path.basename(input_path))[0]
+    return os.path.join(output, f"{name_without_ext}.txt")
+
+
+def handle_output(text: Union[str, Iterable[str]], output_path: Optional[str], input_path: str) -> bool:
+    """Handle the output of extracted text, given either as a string or as an iterable of chunks.
     
-    if not output_path:
-        # Print to console
-        print(text)
-        return
+    Returns False if the output file could not be written. An ExtractionError raised
+    while streaming the chunks is passed on to the caller.
+    """
+    chunks = iter((text,) if isinstance(text, str) else text)
     
-    # Determine if output_path is a directory
-    if os.path.isdir(output_path) or (not os.path.exists(output_path) and output_path.endswith(os.sep)):
-        # Create directory if it doesn't exist
-        os.makedirs(output_path, exist_ok=True)
+    # Nothing to output if the text is empty; this also avoids creating empty files
+    first_chunk = next((chunk for chunk in chunks if chunk), None)
+    if first_chunk is None:
+        return True
+    chunks = itertools.chain((first_chunk,), chunks)
+    
+    if not output_path:
+        out = getattr(sys.stdout, "buffer", None)
+        if out is None or sys.stdout.isatty():
+            # Print to console
+            print("".join(chunks))
+            return True
         
+        # Piped or redirected: skip print's text layer and write encoded chunks straight to
+        # the buffered binary stream, after flushing anything already printed
+        sys.stdout.flush()
+        for chunk in chunks:
+            out.write(chunk.encode('utf-8'))
+        out.write(b"\n")
+        out.flush()
+        return True
+    
+    # Determine if output_path is a directory with a single stat call
+    try:
+        output_is_dir = stat.S_ISDIR(os.stat(output_path).st_mode)
+    except OSError:
+        output_is_dir = output_path.endswith(os.sep)
+        if output_is_dir:
+            # Create directory if it doesn't exist
+            os.makedirs(output_path, exist_ok=True)
+    
+    if output_is_dir:
         # Generate output file name based on input file name
-        base_name = os.path.basename(input_path)
-        name_without_ext = os.path.splitext(base_name)[0]
-        output_file = os.path.join(output_path, f"{name_without_ext}.txt")
+        output_file = _compute_out(input_path, output_path, True)
     else:
         # Ensure the directory for the output file exists
         output_dir = os.path.dirname(output_path)
-        if output_dir and not os.path.exists(output_dir):
-            os.makedirs(output_dir, exist_ok=True)
+        if output_dir:
+            # A file in the way is reported when the output is opened below
+            with contextlib.suppress(FileExistsError):
+                os.makedirs(output_dir, exist_ok=True)
         
         output_file = output_path
     
-    # Write text to the output file
+    # Write text to a temporary file next to the output and move it into place,
+    # so an interrupted run never leaves a truncated output file behind
+    tmp_file = f"{output_file}.{uuid.uuid4().hex[:8]}.tmp"
+    replaced = False
+    try:
+        # Stream chunks straight into a large buffer instead of building one big string
+        with open(tmp_file, 'x', encoding='utf-8', buffering=OUTPUT_BUFFER_SIZE) as f:
+            f.writelines(chunks)
+        os.replace(tmp_file, output_file)
+        replaced = True
+    except ExtractionError:
+        raise
+    except Exception as e:
+        _err(f"Error writing to output file: {str(e)}")
+        return False
+    finally:
+        # Also runs on KeyboardInterrupt or SystemExit, so no temp file is left behind
+        if not replaced:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_file)
+    
+    _err(f"Text extracted to: {output_file}")
+    return True
+
+
+def _process_one(
+    file_path: str,
+    output_path: Optional[str],
+    format_type: Optional[str],
+    verbose: bool,
+    use_cache: bool = True,
+) -> Tuple[str, bool, Optional[str], Optional[str]]:
+    """Extract text from a single file and write it to its output file.
+    
+    Runs in a worker process. Returns (file_path, ok, error, text). error is only set
+    for failures that have not been reported yet; text is only set when no output was
+    requested, so the caller can print it in input order.
+    """
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(text)
-        print(f"Text extracted to: {output_file}")
+        if verbose:
+            _err(f"Processing file: {file_path}")
+        
+        chunks = iter_text(file_path, format_type, verbose, use_cache)
+        
+        if chunks is None:
+            return file_path, False, None, None
+        if not output_path:
+            return file_path, True, None, "".join(chunks)
+        
+        return file_path, handle_output(chunks, output_path, file_path), None, None
+    except ExtractionError as e:
+        return file_path, False, str(e), None
     except Exception as e:
-        print(f"Error writing to output file: {str(e)}")
+        return file_path, False, f"Error processing {file_path}: {str(e)}", None
+
+
+def _report_result(result: Tuple[str, bool, Optional[str], Optional[str]]) -> bool:
+    """Report a failure or print text destined for the console. Returns True on success."""
+    file_path, ok, err, text = result
+    if not ok:
+        if err:
+            _err(err)
+        return False
+    if text is not None:
+        handle_output(text, None, file_path)
+    return True
 
 
 def main() -> None:
@@ -188,7 +714,7 @@ def main() -> None:
     parser.add_argument("file_paths", nargs="+", help="One or more paths to the files from which to extract text")
     parser.add_argument(
         "-f", "--format", 
-        choices=["pdf", "docx", "pptx"], 
+        choices=list(_FMT_TO_FN), 
         help="Specify the file format (pdf, docx, pptx). If omitted, format is inferred from file extension."
     )
     parser.add_argument(
@@ -200,39 +726,48 @@ def main() -> None:
         action="store_true", 
         help="Enable verbose output, displaying additional details like the number of pages or slides processed."
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Always re-extract text instead of reusing cached results from {CACHE_DIR}."
+    )
     
     args = parser.parse_args()
     
     # Handle single file vs multiple files for output
     is_single_file = len(args.file_paths) == 1
-    output_is_dir = args.output and (
+    output_is_dir = bool(args.output) and (
         os.path.isdir(args.output) or 
         args.output.endswith(os.sep) or 
         not is_single_file
     )
     
-    # Process each file
-    for file_path in args.file_paths:
-        if args.verbose:
-            print(f"Processing file: {file_path}")
-        
-        text = extract_text(file_path, args.format, args.verbose)
-        
-        if text is not None:
-            # Determine output path
-            output_path = None
-            if args.output:
-                if output_is_dir:
-                    # Create directory if needed
-                    os.makedirs(args.output, exist_ok=True)
-                    base_name = os.path.basename(file_path)
-                    name_without_ext = os.path.splitext(base_name)[0]
-                    output_path = os.path.join(args.output, f"{name_without_ext}.txt")
-                else:
-                    output_path = args.output
-            
-            handle_output(text, output_path, file_path)
+    # Map every input to its output file up front
+    if output_is_dir:
+        os.makedirs(args.output, exist_ok=True)
+    jobs = [(file_path, _compute_out(file_path, args.output, output_is_dir)) for file_path in args.file_paths]
+    use_cache = not args.no_cache
+    
+    # A single file is processed inline to avoid the pool start-up cost
+    if is_single_file:
+        file_path, output_path = jobs[0]
+        all_ok = _report_result(_process_one(file_path, output_path, args.format, args.verbose, use_cache))
+    else:
+        # Process files in parallel; each extraction is CPU-bound Python and independent
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            futures = [
+                executor.submit(_process_one, file_path, output_path, args.format, args.verbose, use_cache)
+                for file_path, output_path in jobs
+            ]
+            # Report in input order so console output matches the order of arguments
+            all_ok = True
+            for future in futures:
+                if not _report_result(future.result()):
+                    all_ok = False
+    
+    # Individual failures do not stop the batch, but are reflected in the exit status
+    sys.exit(0 if all_ok else 1)
 
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main() 
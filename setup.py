@@ -1,18 +1,34 @@
+import os
+
 from setuptools import setup
 
+# Set XTOTXT_MYPYC=1 to compile extract_text.py into a C extension with mypyc
+# (requires mypy). The pure-Python module stays usable for development.
+ext_modules = []
+if os.environ.get("XTOTXT_MYPYC") == "1":
+    from mypyc.build import mypycify
+
+    # The format backends ship without type stubs
+    ext_modules = mypycify(["--ignore-missing-imports", "extract_text.py"])
+
 setup(
     name="xtotxt",
     version="0.1.0",
     description="Command-line tool for extracting text from PDF, DOCX, and PPTX files",
     py_modules=["extract_text"],
+    ext_modules=ext_modules,
     install_requires=[
+        "pypdfium2>=4.0.0",
         "pdfminer.six>=20221105",
-        "python-docx>=0.8.11", 
+        "python-docx>=0.8.11",
         "python-pptx>=0.6.21",
     ],
+    extras_require={
+        "dev": ["mypy"],
+    },
     entry_points={
         "console_scripts": [
             "extract_text=extract_text:main",
         ],
     },
-) 
\ No newline at end of file
+)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# extract_text is a top-level module next to setup.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
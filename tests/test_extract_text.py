@@ -0,0 +1,310 @@
+"""Tests for extract_text: extractor output, input validation, caching and output handling."""
+import os
+import sys
+import zipfile
+
+import pytest
+
+import extract_text
+
+
+def _make_docx(path):
+    docx = pytest.importorskip("docx")
+    from docx.enum.text import WD_BREAK
+    from docx.oxml import OxmlElement
+    from docx.oxml.ns import qn
+
+    document = docx.Document()
+    document.add_paragraph("Plain paragraph with\ta tab")
+    document.add_paragraph("")
+
+    paragraph = document.add_paragraph("Line")
+    paragraph.add_run().add_break(WD_BREAK.LINE)
+    paragraph.add_run("after line break")
+    paragraph.add_run().add_break(WD_BREAK.PAGE)
+    paragraph.add_run("after page break")
+    paragraph.add_run().add_break(WD_BREAK.COLUMN)
+    paragraph.add_run("after column break")
+
+    # Run content python-docx has no API for: co<noBreakHyphen/>op, <ptab/>, <cr/>
+    run = paragraph.add_run("co")
+    for tag in ("w:noBreakHyphen", "w:t", "w:ptab", "w:cr", "w:t"):
+        run._r.append(OxmlElement(tag))
+    run._r[-4].text = "op"
+    run._r[-1].text = "end"
+
+    # Runs inside a hyperlink count towards the paragraph text
+    hyperlink = OxmlElement("w:hyperlink")
+    link_run = OxmlElement("w:r")
+    link_text = OxmlElement("w:t")
+    link_text.text = " linked"
+    link_run.append(link_text)
+    hyperlink.append(link_run)
+    hyperlink.set(qn("r:id"), "rId99")
+    paragraph._p.append(hyperlink)
+
+    # Table paragraphs are not part of Document.paragraphs
+    document.add_table(rows=1, cols=1).cell(0, 0).text = "in a table"
+    document.add_paragraph("résumé ünïcode")
+    document.save(str(path))
+    return docx
+
+
+def test_docx_matches_python_docx(tmp_path):
+    path = tmp_path / "sample.docx"
+    docx = _make_docx(path)
+
+    expected = "\n".join(p.text for p in docx.Document(str(path)).paragraphs)
+    assert "co-op\t\nend linked" in expected
+    assert extract_text.extract_text(str(path), use_cache=False) == expected
+
+
+def _with_external_entity(path, part, secret):
+    """Rewrite a package part to declare a SYSTEM entity for ``secret`` and use it in place of SENTINEL."""
+    with zipfile.ZipFile(path) as archive:
+        contents = {name: archive.read(name) for name in archive.namelist()}
+    xml = contents[part].decode("utf-8")
+    declaration_end = xml.index("?>") + 2
+    doctype = f'<!DOCTYPE root [<!ENTITY x SYSTEM "{secret.as_uri()}">]>'
+    xml = xml[:declaration_end] + doctype + xml[declaration_end:].replace("SENTINEL", "&x;")
+    contents[part] = xml.encode("utf-8")
+    with zipfile.ZipFile(path, "w") as archive:
+        for name, data in contents.items():
+            archive.writestr(name, data)
+
+
+def test_docx_does_not_expand_external_entities(tmp_path):
+    docx = pytest.importorskip("docx")
+    secret = tmp_path / "secret.txt"
+    secret.write_text("top secret")
+    path = tmp_path / "entity.docx"
+    document = docx.Document()
+    document.add_paragraph("before SENTINEL after")
+    document.save(str(path))
+    _with_external_entity(path, "word/document.xml", secret)
+
+    text = extract_text.extract_text(str(path), use_cache=False)
+    assert "top secret" not in text
+    assert text == "\n".join(p.text for p in docx.Document(str(path)).paragraphs)
+
+
+def _make_pptx(path):
+    pptx = pytest.importorskip("pptx")
+    from pptx.util import Inches
+
+    presentation = pptx.Presentation()
+    for i in range(11):
+        # Every third slide is blank and gets no header
+        if i % 3 == 2:
+            presentation.slides.add_slide(presentation.slide_layouts[6])
+            continue
+        slide = presentation.slides.add_slide(presentation.slide_layouts[1])
+        slide.shapes.title.text = f"Title {i}"
+        body = slide.placeholders[1].text_frame
+        body.text = f"Body {i}\vsoft break"
+        body.add_paragraph().text = "second paragraph"
+        slide.shapes.add_textbox(Inches(1), Inches(1), Inches(1), Inches(1)).text_frame.text = ""
+        # Group members and tables are not top-level shapes with text
+        group = slide.shapes.add_group_shape()
+        group.shapes.add_textbox(0, 0, 10, 10).text_frame.text = "grouped"
+        slide.shapes.add_table(1, 1, 0, 0, 100, 100).table.cell(0, 0).text = "in a table"
+
+    # Move the last slide to the front so part names no longer follow presentation order
+    slide_ids = presentation.slides._sldIdLst
+    last = slide_ids[-1]
+    slide_ids.remove(last)
+    slide_ids.insert(0, last)
+    presentation.save(str(path))
+    return pptx
+
+
+def _pptx_expected(pptx, path):
+    parts = []
+    for i, slide in enumerate(pptx.Presentation(str(path)).slides, 1):
+        texts = [shape.text_frame.text for shape in slide.shapes if shape.has_text_frame and shape.text_frame.text]
+        if texts:
+            parts.append(f"--- Slide {i} ---")
+            parts.extend(texts)
+    return "\n".join(parts)
+
+
+def test_pptx_matches_python_pptx(tmp_path):
+    path = tmp_path / "sample.pptx"
+    pptx = _make_pptx(path)
+
+    expected = _pptx_expected(pptx, path)
+    assert expected.startswith("--- Slide 1 ---\nTitle 10\n")
+    assert extract_text.extract_text(str(path), use_cache=False) == expected
+
+
+def test_pptx_does_not_expand_external_entities(tmp_path):
+    pptx = pytest.importorskip("pptx")
+    secret = tmp_path / "secret.txt"
+    secret.write_text("top secret")
+    path = tmp_path / "entity.pptx"
+    presentation = pptx.Presentation()
+    slide = presentation.slides.add_slide(presentation.slide_layouts[5])
+    slide.shapes.title.text = "before SENTINEL after"
+    presentation.save(str(path))
+    _with_external_entity(path, "ppt/slides/slide1.xml", secret)
+
+    text = extract_text.extract_text(str(path), use_cache=False)
+    assert "top secret" not in text
+    assert text == _pptx_expected(pptx, path)
+
+
+def test_unreadable_input_is_reported(tmp_path, capsys):
+    path = tmp_path / "folder.pdf"
+    path.mkdir()
+
+    assert extract_text.extract_text(str(path), use_cache=False) is None
+    assert "Error reading file" in capsys.readouterr().err
+
+
+def _write_zip(path, names):
+    with zipfile.ZipFile(path, "w") as archive:
+        for name in names:
+            archive.writestr(name, "<x/>")
+
+
+@pytest.mark.parametrize(
+    "name, make",
+    [
+        ("no_signature.pdf", lambda path: path.write_bytes(b"\0" * 1024 + b"%PDF-1.4\n")),
+        ("not_a_zip.docx", lambda path: path.write_bytes(b"plain text, not a package")),
+        ("bad_zip.docx", lambda path: path.write_bytes(b"PK\x03\x04" + b"\0" * 100)),
+        ("not_a_presentation.pptx", lambda path: _write_zip(path, ["word/document.xml"])),
+    ],
+)
+def test_mislabeled_input_is_rejected(tmp_path, capsys, name, make):
+    path = tmp_path / name
+    make(path)
+    file_format = os.path.splitext(name)[1][1:].upper()
+
+    assert extract_text.extract_text(str(path), use_cache=False) is None
+    assert f"Not a valid {file_format} file" in capsys.readouterr().err
+
+
+def test_path_through_a_file_is_reported(tmp_path, capsys):
+    parent = tmp_path / "c.pdf"
+    parent.write_bytes(b"%PDF-1.4\n")
+
+    assert extract_text.extract_text(str(parent / "x.pdf"), use_cache=False) is None
+    assert "Error reading file" in capsys.readouterr().err
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    path = tmp_path / "cache"
+    monkeypatch.setattr(extract_text, "CACHE_DIR", str(path))
+    return path
+
+
+def _cache_entries(cache_dir):
+    return sorted(os.listdir(cache_dir)) if cache_dir.exists() else []
+
+
+def _make_simple_docx(path, text):
+    docx = pytest.importorskip("docx")
+    document = docx.Document()
+    document.add_paragraph(text)
+    document.save(str(path))
+
+
+def test_cache_hit_returns_cached_text(tmp_path, cache_dir, capsys):
+    path = tmp_path / "cached.docx"
+    _make_simple_docx(path, "cached text")
+
+    assert extract_text.extract_text(str(path)) == "cached text"
+    entries = _cache_entries(cache_dir)
+    assert len(entries) == 1 and entries[0].endswith(".txt")
+
+    capsys.readouterr()
+    assert extract_text.extract_text(str(path), verbose=True) == "cached text"
+    assert "Loaded cached text" in capsys.readouterr().err
+
+
+def test_cache_misses_when_mtime_or_size_changes(tmp_path, cache_dir):
+    path = tmp_path / "changed.docx"
+    _make_simple_docx(path, "first")
+    assert extract_text.extract_text(str(path)) == "first"
+    st = os.stat(path)
+
+    # Same size and content, newer mtime
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert extract_text.extract_text(str(path)) == "first"
+    assert len(_cache_entries(cache_dir)) == 2
+
+    # Different size, mtime put back to the original value
+    _make_simple_docx(path, "second, longer text")
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert os.stat(path).st_size != st.st_size
+    assert extract_text.extract_text(str(path)) == "second, longer text"
+    assert len(_cache_entries(cache_dir)) == 3
+
+
+def test_failed_or_empty_extraction_is_not_cached(tmp_path, cache_dir):
+    empty = tmp_path / "empty.docx"
+    _make_simple_docx(empty, "")
+    assert extract_text.extract_text(str(empty)) == ""
+
+    broken = tmp_path / "broken.docx"
+    _make_simple_docx(broken, "lost")
+    with zipfile.ZipFile(empty) as source, zipfile.ZipFile(broken, "w") as target:
+        for name in source.namelist():
+            data = source.read(name)
+            if name == "word/document.xml":
+                data = data[: len(data) // 2]
+            target.writestr(name, data)
+    assert extract_text.extract_text(str(broken)) == ""
+
+    assert _cache_entries(cache_dir) == []
+
+
+def test_cache_can_be_bypassed(tmp_path, cache_dir, monkeypatch):
+    path = tmp_path / "bypass.docx"
+    _make_simple_docx(path, "fresh text")
+
+    assert extract_text.extract_text(str(path), use_cache=False) == "fresh text"
+    assert _cache_entries(cache_dir) == []
+
+    # Plant a stale entry; only cached reads may return it
+    assert extract_text.extract_text(str(path)) == "fresh text"
+    (entry,) = _cache_entries(cache_dir)
+    (cache_dir / entry).write_text("stale text", encoding="utf-8")
+    assert extract_text.extract_text(str(path)) == "stale text"
+    assert extract_text.extract_text(str(path), use_cache=False) == "fresh text"
+
+    out = tmp_path / "out.txt"
+    monkeypatch.setattr(sys, "argv", ["extract_text", "--no-cache", "-o", str(out), str(path)])
+    with pytest.raises(SystemExit) as exit_info:
+        extract_text.main()
+    assert exit_info.value.code == 0
+    assert out.read_text(encoding="utf-8") == "fresh text"
+
+
+def test_interrupted_write_leaves_no_files(tmp_path):
+    def chunks():
+        yield "partial text"
+        raise KeyboardInterrupt
+
+    out = tmp_path / "out.txt"
+    with pytest.raises(KeyboardInterrupt):
+        extract_text.handle_output(chunks(), str(out), "input.pdf")
+    assert os.listdir(tmp_path) == []
+
+
+def test_batch_continues_after_a_failure(tmp_path, monkeypatch):
+    good = tmp_path / "good.docx"
+    _make_simple_docx(good, "good text")
+    missing = tmp_path / "missing.docx"
+    out_dir = tmp_path / "out"
+
+    monkeypatch.setattr(
+        sys, "argv", ["extract_text", "--no-cache", "-o", str(out_dir), str(missing), str(good)]
+    )
+    with pytest.raises(SystemExit) as exit_info:
+        extract_text.main()
+    assert exit_info.value.code == 1
+    assert (out_dir / "good.txt").read_text(encoding="utf-8") == "good text"
+    assert not (out_dir / "missing.txt").exists()